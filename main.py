@@ -4,9 +4,12 @@ FoodSync - AI-powered food tracking system
 Automatically analyzes food photos from Google Drive and logs to Google Sheets
 """
 
+import os
 import sys
-import time
+import asyncio
 import argparse
+import multiprocessing
+import concurrent.futures
 from pathlib import Path
 
 # Add src to path
@@ -15,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.utils.config import config
 from src.utils.logger import setup_logger
 from src.utils.image_processor import ImageProcessor
+from src.utils.food_classifier import FoodClassifier
 from src.services.google_drive import GoogleDriveService
 from src.services.openai_service import OpenAIService
 from src.services.google_sheets import GoogleSheetsService
@@ -37,98 +41,152 @@ class FoodSync:
         self.openai_service = OpenAIService()
         self.sheets_service = GoogleSheetsService()
         self.image_processor = ImageProcessor()
+        self.food_classifier = FoodClassifier()
+
+        # CPU-bound decode/resize runs in worker processes so it doesn't
+        # hold the GIL and stall the concurrent network coroutines.
+        # spawn rather than fork: workers start lazily, after download
+        # threads exist, and forking a multi-threaded process can
+        # deadlock a worker on an inherited held lock
+        self.cpu_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context('spawn')
+        )
         
         # Ensure Google Sheet has proper headers
         self.sheets_service.ensure_headers()
         
         logger.info("FoodSync initialized successfully")
     
-    def process_photo(self, file_info):
+    async def process_photo(self, file_info):
         """Process a single photo"""
         logger.info(f"Processing photo: {file_info['name']}")
-        
+
         try:
             # Check if image format is supported
             if not self.image_processor.is_supported_format(file_info['name']):
                 logger.warning(f"Unsupported format: {file_info['name']}")
                 return None
-            
+
             # Download the file
             logger.debug(f"Downloading file {file_info['id']}")
-            file_data = self.drive_service.download_file(file_info['id'], file_info['name'])
-            
+            file_data = await self.drive_service.download_file_async(
+                file_info['id'], file_info['name'],
+                file_size=int(file_info.get('size') or 0)
+            )
+
             if not file_data:
                 logger.error(f"Failed to download {file_info['name']}")
                 return None
-            
+
             # Process image (convert to JPEG, resize if needed)
-            processed_image = self.image_processor.process_image(file_data, file_info['name'])
-            
+            loop = asyncio.get_running_loop()
+            processed_image = await loop.run_in_executor(
+                self.cpu_pool, ImageProcessor.process_image,
+                file_data, file_info['name']
+            )
+
             if not processed_image:
                 logger.error(f"Failed to process image {file_info['name']}")
                 return None
-            
+
+            # Cheap local gate: obvious non-food photos skip the base64
+            # encode, upload, and vision call entirely
+            if not await asyncio.to_thread(self.food_classifier.is_probably_food, processed_image):
+                logger.info(f"Local classifier found no food in {file_info['name']}")
+                self.drive_service.mark_as_processed(file_info['id'])
+                return None
+
             # Analyze with OpenAI
             logger.debug(f"Analyzing image with OpenAI Vision")
-            food_data = self.openai_service.analyze_and_generate_recipe(processed_image)
-            
+            food_data = await self.openai_service.analyze_and_generate_recipe(processed_image)
+
             if not food_data:
                 logger.info(f"No food detected in {file_info['name']}")
                 self.drive_service.mark_as_processed(file_info['id'])
                 return None
-            
+
             # Add photo URL
             food_data['photo_url'] = file_info.get('webViewLink', '')
-            
-            # Log to Google Sheets
-            logger.debug(f"Logging to Google Sheets")
-            if self.sheets_service.add_food_entry(food_data):
-                logger.info(f"Successfully processed: {file_info['name']} - {food_data['food_name']}")
-                self.drive_service.mark_as_processed(file_info['id'])
-                return food_data
-            else:
-                logger.error(f"Failed to log to sheets: {file_info['name']}")
-                return None
-                
+
+            logger.info(f"Successfully processed: {file_info['name']} - {food_data['food_name']}")
+            return food_data
+
         except Exception as e:
             logger.error(f"Error processing photo {file_info['name']}: {e}", exc_info=True)
             return None
-    
-    def run_once(self, hours_back=24):
+
+    async def run_once(self, hours_back=24, photos=None):
         """Run the sync process once"""
         logger.info(f"Checking for photos from the last {hours_back} hours")
-        
-        # Get recent photos
-        photos = self.drive_service.get_recent_photos(hours_back=hours_back)
-        
+
+        # Get recent photos (unless the caller already fetched the listing)
+        if photos is None:
+            photos = await asyncio.to_thread(
+                self.drive_service.get_recent_photos, hours_back=hours_back
+            )
+
         if not photos:
             logger.info("No new photos found")
             return
-        
+
         logger.info(f"Found {len(photos)} photos to process")
-        
-        # Process each photo
+
+        # Process photos concurrently, bounded by a semaphore so we don't
+        # blow through provider rate limits
+        semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_PHOTOS)
+
+        async def process_with_limit(photo):
+            async with semaphore:
+                return await self.process_photo(photo)
+
+        results = await asyncio.gather(*[process_with_limit(photo) for photo in photos])
+
+        # Flush all entries to Google Sheets in a single append, then mark
+        # the corresponding files as processed
+        entries = [result for result in results if result]
         processed_count = 0
-        for photo in photos:
-            result = self.process_photo(photo)
-            if result:
-                processed_count += 1
-        
+        if entries:
+            logger.debug(f"Logging {len(entries)} entries to Google Sheets")
+            if await asyncio.to_thread(self.sheets_service.batch_add_entries, entries):
+                for photo, result in zip(photos, results):
+                    if result:
+                        self.drive_service.mark_as_processed(photo['id'])
+                processed_count = len(entries)
+            else:
+                logger.error("Failed to log batch to sheets")
+
+        # Persist the processed files list once per run instead of per file
+        self.drive_service.flush()
+
         logger.info(f"Processed {processed_count} food photos")
     
-    def run_monitor(self, interval_minutes=None):
+    async def run_monitor(self, interval_minutes=None):
         """Run continuous monitoring"""
         interval = interval_minutes or config.CHECK_INTERVAL_MINUTES
         logger.info(f"Starting continuous monitoring (checking every {interval} minutes)")
-        
+
+        photos = None
         while True:
             try:
-                self.run_once(hours_back=24)
+                await self.run_once(hours_back=24, photos=photos)
             except Exception as e:
                 logger.error(f"Error during monitoring cycle: {e}", exc_info=True)
-            
+
             logger.info(f"Waiting {interval} minutes until next check...")
-            time.sleep(interval * 60)
+
+            # Start the next Drive listing now so its round-trip happens
+            # inside the sleep window instead of after it
+            next_listing = asyncio.create_task(asyncio.to_thread(
+                self.drive_service.get_recent_photos, hours_back=24
+            ))
+            await asyncio.sleep(interval * 60)
+
+            try:
+                photos = await next_listing
+            except Exception as e:
+                logger.error(f"Error prefetching photo listing: {e}", exc_info=True)
+                photos = None
 
 def main():
     parser = argparse.ArgumentParser(description='FoodSync - AI-powered food photo tracker')
@@ -143,9 +201,9 @@ def main():
     
     try:
         if args.monitor:
-            app.run_monitor(interval_minutes=args.interval)
+            asyncio.run(app.run_monitor(interval_minutes=args.interval))
         else:
-            app.run_once(hours_back=args.hours)
+            asyncio.run(app.run_once(hours_back=args.hours))
     except KeyboardInterrupt:
         logger.info("Shutting down FoodSync...")
         sys.exit(0)
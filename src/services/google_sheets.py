@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime
 from typing import List, Dict, Any
 import gspread
@@ -40,20 +41,28 @@ class GoogleSheetsService:
     def ensure_headers(self):
         """Ensure the sheet has the correct headers"""
         try:
+            # Skip the Sheets round-trip when headers were verified
+            # recently; crash-restarts in monitor mode re-pay it otherwise
+            marker = config.HEADERS_MARKER_FILE
+            if marker.exists() and time.time() - marker.stat().st_mtime < 24 * 3600:
+                logger.debug("Headers verified recently, skipping check")
+                return True
+
             # Check if headers exist
             headers = self.sheet.row_values(1)
             expected_headers = ['Date', 'Food Name', 'Recipe', 'Photo URL']
-            
+
             if headers != expected_headers:
                 logger.info("Setting up sheet headers")
                 self.sheet.update('A1:D1', [expected_headers])
-                
+
                 # Format headers
                 self.sheet.format('A1:D1', {
                     'textFormat': {'bold': True},
                     'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
                 })
-            
+
+            marker.touch()
             return True
         except Exception as e:
             logger.error(f"Error setting up headers: {e}")
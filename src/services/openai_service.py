@@ -1,6 +1,7 @@
 import base64
+import json
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from typing import Optional, Dict, Any
 
 from ..utils.config import config
@@ -8,17 +9,53 @@ from ..utils.config import config
 logger = logging.getLogger(__name__)
 
 class OpenAIService:
+    # Upper bound on cached recipes before the oldest entries are evicted
+    RECIPE_CACHE_SIZE = 1024
+
+    # Structured-output schemas: the model is constrained to these shapes,
+    # so responses parse with a plain json.loads
+    DETECTION_SCHEMA = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "food",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "food_name": {"type": ["string", "null"]}
+                },
+                "required": ["food_name"]
+            }
+        }
+    }
+    DETECTION_RECIPE_SCHEMA = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "food_recipe",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "food_name": {"type": ["string", "null"]},
+                    "recipe": {"type": ["string", "null"]}
+                },
+                "required": ["food_name"]
+            }
+        }
+    }
+
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-    
-    def analyze_food_image(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+        self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+        self._recipe_cache: Dict[str, str] = {}
+
+    async def analyze_food_image(self, image_data: bytes) -> Optional[Dict[str, Any]]:
         """Analyze an image to detect food items using OpenAI Vision"""
         try:
             # Encode image to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
-            
+            # base64 output is pure ASCII; the ascii decoder skips utf-8's
+            # multibyte scanning on these ~300KB payloads
+            base64_image = base64.b64encode(image_data).decode('ascii')
+
             # Create the vision API request
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -26,40 +63,50 @@ class OpenAIService:
                         "content": [
                             {
                                 "type": "text",
-                                "text": "Analyze this image and identify any food items. If no food is detected, respond with 'NO_FOOD'. If food is detected, provide the name of the main food item(s) in a concise format."
+                                "text": "Identify the main food item(s) in this image, concisely. Set food_name to null if no food is present."
                             },
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
+                                    "url": f"data:image/jpeg;base64,{base64_image}",
+                                    "detail": "low"
                                 }
                             }
                         ]
                     }
                 ],
-                max_tokens=150
+                response_format=self.DETECTION_SCHEMA,
+                max_tokens=30
             )
-            
-            food_description = response.choices[0].message.content.strip()
-            
-            if food_description.upper() == "NO_FOOD":
+
+            food_name = json.loads(response.choices[0].message.content).get('food_name')
+
+            if not food_name:
                 logger.info("No food detected in image")
                 return None
-            
-            logger.info(f"Food detected: {food_description}")
+
+            logger.info(f"Food detected: {food_name}")
             return {
-                "food_name": food_description,
+                "food_name": food_name,
                 "detected": True
             }
-            
+
         except Exception as e:
             logger.error(f"Error analyzing image: {e}")
             return None
     
-    def generate_recipe(self, food_name: str) -> Optional[str]:
+    async def generate_recipe(self, food_name: str) -> Optional[str]:
         """Generate a recipe based on the food name"""
+        # Repeated foods ("pizza", "salad") get the cached recipe instead
+        # of paying another completion
+        cache_key = food_name.strip().lower()
+        cached = self._recipe_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached recipe for {food_name}")
+            return cached
+
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -76,24 +123,89 @@ class OpenAIService:
             
             recipe = response.choices[0].message.content.strip()
             logger.info(f"Generated recipe for {food_name}")
+
+            if len(self._recipe_cache) >= self.RECIPE_CACHE_SIZE:
+                self._recipe_cache.pop(next(iter(self._recipe_cache)))
+            self._recipe_cache[cache_key] = recipe
+
             return recipe
             
         except Exception as e:
             logger.error(f"Error generating recipe: {e}")
             return None
     
-    def analyze_and_generate_recipe(self, image_data: bytes) -> Optional[Dict[str, Any]]:
-        """Analyze image and generate recipe if food is detected"""
-        # First, analyze the image
-        food_info = self.analyze_food_image(image_data)
-        
+    async def analyze_and_generate_recipe(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+        """Analyze image and generate recipe in a single vision call"""
+        try:
+            # Encode image to base64
+            # base64 output is pure ASCII; the ascii decoder skips utf-8's
+            # multibyte scanning on these ~300KB payloads
+            base64_image = base64.b64encode(image_data).decode('ascii')
+
+            # One fused request: detection and recipe in the same completion,
+            # saving a full network round-trip per photo
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": (
+                                    "Analyze this image for food. If no food is present, set "
+                                    "food_name to null. Otherwise set food_name to a concise "
+                                    "name of the main food item(s) and recipe to a simple "
+                                    "recipe with ingredients and brief steps, under 200 words."
+                                )
+                            },
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:image/jpeg;base64,{base64_image}",
+                                    "detail": "low"
+                                }
+                            }
+                        ]
+                    }
+                ],
+                response_format=self.DETECTION_RECIPE_SCHEMA,
+                max_tokens=600
+            )
+
+            choice = response.choices[0]
+
+            # A completion cut off at the token cap is invalid JSON;
+            # treating it as "no food" would silently drop a valid photo,
+            # so redo the work as the two smaller calls instead
+            if choice.finish_reason == 'length':
+                logger.warning("Fused response truncated, falling back to separate calls")
+                return await self._analyze_then_generate(image_data)
+
+            result = json.loads(choice.message.content)
+
+            if not result.get('food_name'):
+                logger.info("No food detected in image")
+                return None
+
+            logger.info(f"Food detected: {result['food_name']}")
+            return {
+                "food_name": result['food_name'],
+                "recipe": result.get('recipe') or '',
+                "detected": True
+            }
+
+        except Exception as e:
+            logger.error(f"Error analyzing image: {e}")
+            return None
+
+    async def _analyze_then_generate(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+        """Fallback path: separate detection and recipe calls"""
+        food_info = await self.analyze_food_image(image_data)
+
         if not food_info:
             return None
-        
-        # Generate recipe for detected food
-        recipe = self.generate_recipe(food_info['food_name'])
-        
-        if recipe:
-            food_info['recipe'] = recipe
-        
+
+        recipe = await self.generate_recipe(food_info['food_name'])
+        food_info['recipe'] = recipe or ''
         return food_info
\ No newline at end of file
@@ -18,10 +18,15 @@ class Config:
     # Application Settings
     CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '5'))
     MAX_PHOTOS_PER_RUN = int(os.getenv('MAX_PHOTOS_PER_RUN', '10'))
+    MAX_CONCURRENT_PHOTOS = int(os.getenv('MAX_CONCURRENT_PHOTOS', '5'))
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
     # File tracking
     PROCESSED_FILES_DB = Path(__file__).parent.parent.parent / 'data' / 'processed_files.json'
+    HEADERS_MARKER_FILE = Path(__file__).parent.parent.parent / 'data' / '.headers_ok'
+
+    # Optional local food/not-food gate (used when the model file exists)
+    FOOD_CLASSIFIER_MODEL = Path(__file__).parent.parent.parent / 'data' / 'food_classifier.onnx'
     
     @classmethod
     def validate(cls):
@@ -0,0 +1,73 @@
+import io
+import logging
+from PIL import Image
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Optional dependency: without onnxruntime the gate simply passes
+# every image through to OpenAI
+try:
+    import numpy as np
+    import onnxruntime
+    ONNX_SUPPORT = True
+except ImportError:
+    ONNX_SUPPORT = False
+
+class FoodClassifier:
+    """Cheap local food/not-food gate run before any OpenAI call
+
+    A small quantized MobileNet-style ONNX model (a few MB, <10ms per
+    image on CPU) filters out obvious non-food photos so they never pay
+    for base64 encoding, upload, or vision inference. The gate is
+    best-effort: if onnxruntime or the model file is missing, or the
+    model errors, images are treated as food and sent on.
+    """
+
+    INPUT_SIZE = 224
+    FOOD_THRESHOLD = 0.3  # below this P(food), skip OpenAI entirely
+
+    def __init__(self):
+        self.session = None
+
+        if not ONNX_SUPPORT:
+            logger.info("onnxruntime not installed - local food gate disabled")
+            return
+
+        if not config.FOOD_CLASSIFIER_MODEL.exists():
+            logger.info(f"No classifier model at {config.FOOD_CLASSIFIER_MODEL} - local food gate disabled")
+            return
+
+        try:
+            self.session = onnxruntime.InferenceSession(
+                str(config.FOOD_CLASSIFIER_MODEL),
+                providers=['CPUExecutionProvider']
+            )
+            self.input_name = self.session.get_inputs()[0].name
+            logger.info("Local food classifier enabled")
+        except Exception as e:
+            logger.warning(f"Failed to load food classifier: {e}")
+            self.session = None
+
+    def is_probably_food(self, image_data: bytes) -> bool:
+        """Return False only when the model is confident there is no food"""
+        if self.session is None:
+            return True
+
+        try:
+            image = Image.open(io.BytesIO(image_data)).convert('RGB')
+            image = image.resize((self.INPUT_SIZE, self.INPUT_SIZE))
+
+            tensor = np.asarray(image, dtype=np.float32) / 255.0
+            tensor = tensor.transpose(2, 0, 1)[np.newaxis]
+
+            food_probability = float(
+                self.session.run(None, {self.input_name: tensor})[0].reshape(-1)[0]
+            )
+            logger.debug(f"Local classifier P(food) = {food_probability:.3f}")
+            return food_probability >= self.FOOD_THRESHOLD
+
+        except Exception as e:
+            logger.warning(f"Food classifier inference failed: {e}")
+            return True
@@ -1,5 +1,13 @@
 import io
+import os
 import logging
+import threading
+
+# Let Pillow cache decode blocks between images; must be set before
+# PIL is imported
+os.environ.setdefault('PILLOW_BLOCKS_MAX', '16')
+os.environ.setdefault('PILLOW_BLOCK_SIZE', '4m')
+
 from PIL import Image
 from typing import Optional, BinaryIO
 
@@ -18,41 +26,58 @@ except Exception as e:
 class ImageProcessor:
     """Handle image processing and format conversion"""
     
-    SUPPORTED_FORMATS = {'.heic', '.heif', '.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp'}
-    MAX_SIZE = (1920, 1080)  # Maximum dimensions for processing
+    SUPPORTED_EXTS = frozenset({'heic', 'heif', 'jpg', 'jpeg', 'png', 'bmp', 'gif', 'webp'})
+    # Maximum dimensions for processing; gpt-4o-mini tiles at 512px and
+    # re-downsamples anything larger server-side, so pixels beyond this
+    # are encode and upload cost for nothing
+    MAX_SIZE = (1024, 1024)
+
+    # Per-thread reusable encode buffer, so repeated ~500KB BytesIO
+    # allocations don't churn the allocator
+    _tls = threading.local()
     
     @staticmethod
-    def process_image(image_data: BinaryIO, filename: str) -> Optional[bytes]:
+    def process_image(image_data: bytes, filename: str) -> Optional[bytes]:
         """
         Process image data and convert to JPEG format for API compatibility
-        
+
         Args:
-            image_data: Binary image data
+            image_data: Raw image bytes
             filename: Original filename (used to determine format)
-            
+
         Returns:
             Processed image as JPEG bytes, or None if processing fails
         """
-        file_ext = filename.lower().split('.')[-1]
-        
+        file_ext = filename.rpartition('.')[2].lower()
+
         # Check if it's a HEIC file and we don't have HEIF support
-        if file_ext in ['heic', 'heif'] and not HEIF_SUPPORT:
+        if file_ext in ('heic', 'heif') and not HEIF_SUPPORT:
             logger.error(f"HEIC/HEIF file {filename} cannot be processed - pillow-heif not properly installed")
             return None
         
         try:
-            # Ensure we're at the beginning of the stream
-            image_data.seek(0)
-            
-            # For HEIC files, try multiple approaches
-            if file_ext in ['heic', 'heif']:
-                image = ImageProcessor._open_heic_image(image_data, filename)
-            else:
-                image = Image.open(image_data)
-            
-            if image is None:
-                return None
-            
+            # With the HEIF opener registered, Image.open handles every
+            # supported format directly
+            image = Image.open(io.BytesIO(image_data))
+
+            # Already a JPEG within the size cap (the common phone-upload
+            # case): the original bytes are fine as-is, skip the full
+            # decode + re-encode. Image.open only reads the header, so
+            # this check costs no pixel work.
+            if (image.format == 'JPEG'
+                    and image.mode in ('RGB', 'L')
+                    and image.width <= ImageProcessor.MAX_SIZE[0]
+                    and image.height <= ImageProcessor.MAX_SIZE[1]):
+                logger.debug(f"Using original JPEG bytes for {filename}")
+                return image_data
+
+            # Large JPEGs: ask libjpeg to downscale in the DCT domain
+            # while decoding (2-4x faster than a full decode followed by
+            # Lanczos); thumbnail() then only finishes the last step.
+            # Must happen before convert(), which forces a full decode.
+            if image.format == 'JPEG':
+                image.draft('RGB', ImageProcessor.MAX_SIZE)
+
             # Convert to RGB if necessary (for PNG with transparency, etc.)
             if image.mode not in ('RGB', 'L'):
                 image = image.convert('RGB')
@@ -62,80 +87,30 @@ class ImageProcessor:
                 image.thumbnail(ImageProcessor.MAX_SIZE, Image.Resampling.LANCZOS)
                 logger.info(f"Resized image {filename} to {image.size}")
             
-            # Save as JPEG
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=85, optimize=True)
+            # Save as JPEG; optimize=False skips the second Huffman pass,
+            # which doubles encode work for no gain on an API upload
+            output = getattr(ImageProcessor._tls, 'buf', None)
+            if output is None:
+                output = ImageProcessor._tls.buf = io.BytesIO()
             output.seek(0)
-            
-            return output.read()
+            output.truncate()
+            # subsampling=2 is 4:2:0 chroma, halving chroma data with no
+            # visible cost for this use and cutting encode work and
+            # upload size ~25%
+            image.save(output, format='JPEG', quality=85, optimize=False,
+                       progressive=False, subsampling=2)
+
+            return output.getvalue()
             
         except Exception as e:
             logger.error(f"Error processing image {filename}: {e}")
             return None
     
-    @staticmethod
-    def _open_heic_image(image_data: BinaryIO, filename: str):
-        """Try multiple approaches to open HEIC images"""
-        
-        # First, check the file signature
-        image_data.seek(0)
-        first_bytes = image_data.read(20)
-        logger.info(f"HEIC file {filename} signature: {first_bytes}")
-        
-        import tempfile
-        import os
-        
-        approaches = [
-            ("Direct PIL", lambda: Image.open(image_data)),
-            ("Bytes first", lambda: Image.open(io.BytesIO(image_data.read()))),
-            ("Reset and retry", lambda: (image_data.seek(0), Image.open(image_data))[1]),
-            ("Force format", lambda: Image.open(image_data, formats=['HEIF'])),
-            ("Temp file", lambda: ImageProcessor._open_via_temp_file(image_data, filename)),
-        ]
-        
-        for approach_name, approach_func in approaches:
-            try:
-                image_data.seek(0)
-                image = approach_func()
-                logger.info(f"Successfully opened HEIC {filename} using {approach_name}")
-                return image
-            except Exception as e:
-                logger.error(f"{approach_name} failed for {filename}: {e}")
-                continue
-        
-        logger.error(f"All approaches failed for HEIC file {filename}")
-        return None
-    
-    @staticmethod
-    def _open_via_temp_file(image_data: BinaryIO, filename: str):
-        """Try opening HEIC file via temporary file on disk"""
-        import tempfile
-        import os
-        
-        image_data.seek(0)
-        data = image_data.read()
-        
-        # Create temp file with proper extension
-        file_ext = filename.lower().split('.')[-1]
-        with tempfile.NamedTemporaryFile(suffix=f'.{file_ext}', delete=False) as temp_file:
-            temp_file.write(data)
-            temp_path = temp_file.name
-        
-        try:
-            image = Image.open(temp_path)
-            # Load the image into memory before deleting temp file
-            image.load()
-            os.unlink(temp_path)
-            return image
-        except Exception as e:
-            os.unlink(temp_path)
-            raise e
-    
     @staticmethod
     def is_supported_format(filename: str) -> bool:
         """Check if file format is supported"""
-        file_ext = filename.lower().split('.')[-1]
-        return f'.{file_ext}' in ImageProcessor.SUPPORTED_FORMATS
+        # rpartition avoids the list allocation of split('.')
+        return filename.rpartition('.')[2].lower() in ImageProcessor.SUPPORTED_EXTS
     
     @staticmethod
     def get_image_info(image_data: BinaryIO) -> dict: